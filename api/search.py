@@ -1,38 +1,107 @@
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
-import json
 import csv
-import math
-from collections import defaultdict
+import io
+import mmap
+import os
+import re
+import sys
+import threading
 import traceback
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
+
+import numpy as np
+import orjson
+
+try:
+    # opsional: kalau numba tersedia, kernel scoring dijalankan sebagai kode native
+    from numba import njit
+except ImportError:
+    njit = None
 
 # =====================================
 # GLOBAL STATE
 # =====================================
-INVERTED_INDEX = {}
-DOC_META = {}
-DOC_LENGTHS = {}
-DOC_CONTENT = {}  # <-- isi dari corpus_clean_v2.csv (content_final)
+# doc meta layout SoA, index list/array = doc_id
+URLS = []
+TITLES = []
+IMAGES = []
+DOC_LENS = np.zeros(0, dtype=np.int32)
+CORPUS_FILE = "data/corpus_clean_v2.csv"
+CORPUS_OFFSETS_FILE = "data/corpus_offsets.npy"
+CORPUS_MM = None  # mmap read-only dari corpus_clean_v2.csv
+CORPUS_OFFSETS = np.zeros((0, 2), dtype=np.int64)  # doc_id -> (byte offset, length)
+CORPUS_CONTENT_COL = -1  # index kolom content_final
 TOTAL_DOCS = 0
+DL_ARR = np.zeros(0, dtype=np.float32)  # panjang dokumen, index = doc_id
+DL_NORM = np.zeros(0, dtype=np.float32)  # k1 * (1 - b + b * dl / avg_dl), index = doc_id
+AVG_DL = 300.0
+
+# index biner hasil build_index_bin.py (dari inverted_index.json)
+INDEX_BIN_FILE = "data/index.bin"
+TERMS_FILE = "data/terms.json"
+
+# matriks kontribusi BM25 (term x doc) format CSR:
+# baris term_id ada di CSR_DOC_IDS / CONTRIB_CSR [CSR_INDPTR[t], CSR_INDPTR[t+1])
+TERM_ID = {}  # term -> term_id
+CSR_INDPTR = np.zeros(1, dtype=np.int32)
+CSR_DOC_IDS = np.zeros(0, dtype=np.int32)
+CSR_TFS = np.zeros(0, dtype=np.int32)
+CONTRIB_CSR = np.zeros(0, dtype=np.float32)
+DF_ARR = np.zeros(0, dtype=np.int32)  # document frequency per term_id
+IDF_ARR = np.zeros(0, dtype=np.float32)  # idf per term_id
+TERM_UB = np.zeros(0, dtype=np.float32)  # skor maksimum yg bisa disumbang term_id ke satu doc
+
+# parameter BM25
+K1 = 1.5
+B = 0.75
 INIT_ERROR = None
 
+_BOOTSTRAP_LOCK = threading.Lock()
+
 
 def log(msg: str):
     print("[search.py]", msg)
 
 
 # =====================================
-# LOAD INVERTED INDEX
-# format: { "kompas": { "0": 1, "1": 3, ... }, ... }
+# LOAD INVERTED INDEX (BINER, MMAP)
+# index.bin (int32): [num_terms][offsets x (num_terms+1)][dids x nnz][tfs x nnz]
+#   postings term_id ada di dids/tfs [offsets[t], offsets[t+1])
+# terms.json       : { "kompas": 0, ... }
+# satu file di-mmap: tidak ada parsing saat cold start, OS hanya memuat
+# halaman postings yang benar-benar disentuh query
 # =====================================
-try:
-    log("Loading data/inverted_index.json ...")
-    with open("data/inverted_index.json", "r", encoding="utf-8") as f:
-        INVERTED_INDEX = json.load(f)
-    log(f"inverted_index has {len(INVERTED_INDEX)} terms")
-except Exception as e:
-    INIT_ERROR = f"Failed to load inverted_index.json: {e}"
-    traceback.print_exc()
+def _load_index():
+    global CSR_DOC_IDS, CSR_TFS, CSR_INDPTR, TERM_ID, INIT_ERROR
+    try:
+        log(f"Mapping {INDEX_BIN_FILE} ...")
+        mm = np.memmap(INDEX_BIN_FILE, dtype="<i4", mode="r")
+        num_terms = int(mm[0])
+        CSR_INDPTR = mm[1:num_terms + 2]
+        nnz = int(CSR_INDPTR[-1])
+        hdr = num_terms + 2
+        if mm.size != hdr + 2 * nnz:
+            raise ValueError(f"{INDEX_BIN_FILE} size mismatch, rebuild with build_index_bin.py")
+        CSR_DOC_IDS = mm[hdr:hdr + nnz]
+        CSR_TFS = mm[hdr + nnz:hdr + 2 * nnz]
+        with open(TERMS_FILE, "rb") as f:
+            # key di-intern supaya lookup token query (juga di-intern) bisa
+            # lewat jalur cepat perbandingan pointer
+            TERM_ID = {sys.intern(t): i for t, i in orjson.loads(f.read()).items()}
+        log(f"index has {len(TERM_ID)} terms, {CSR_DOC_IDS.size} postings")
+    except FileNotFoundError as e:
+        INIT_ERROR = f"Index file not found: {e.filename} (run build_index_bin.py)"
+        traceback.print_exc()
+    except Exception as e:
+        INIT_ERROR = f"Failed to load index: {e}"
+        traceback.print_exc()
+
+
+def _cell(row, col):
+    return row[col] if col is not None and col < len(row) else ""
 
 
 # =====================================
@@ -40,137 +109,387 @@ except Exception as e:
 # doc_meta.csv:
 # doc_id,url,title,image_url,doc_len
 # =====================================
-try:
-    log("Loading data/doc_meta.csv ...")
-    with open("data/doc_meta.csv", "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            doc_id = str(row.get("doc_id"))
-            if not doc_id or doc_id == "None":
-                continue
-
-            DOC_META[doc_id] = {
-                "url": row.get("url", ""),
-                "title": row.get("title", "Untitled"),
-                "image_url": row.get("image_url", ""),
-                "doc_len": int(row.get("doc_len", 1) or 1),
-            }
-            DOC_LENGTHS[doc_id] = DOC_META[doc_id]["doc_len"]
-
-    TOTAL_DOCS = len(DOC_META)
-
-    # fallback kalau meta kosong tapi index ada
-    if TOTAL_DOCS == 0 and INVERTED_INDEX:
-        all_ids = set()
-        for postings in INVERTED_INDEX.values():
-            for d in postings.keys():
-                all_ids.add(str(d))
-        TOTAL_DOCS = len(all_ids)
-
-    log(f"doc_meta has {TOTAL_DOCS} docs")
-except FileNotFoundError:
-    log("doc_meta.csv not found, DOC_META is empty")
-except Exception as e:
-    INIT_ERROR = f"Failed to load doc_meta.csv: {e}"
-    traceback.print_exc()
+def _load_doc_meta():
+    global DOC_LENS, TOTAL_DOCS, INIT_ERROR
+    try:
+        log("Loading data/doc_meta.csv ...")
+        doc_lens_raw = []
+        with open("data/doc_meta.csv", "r", encoding="utf-8") as f:
+            # csv.reader (bukan DictReader) supaya tidak bikin dict per baris;
+            # diasumsikan baris ke-i = doc_id i
+            reader = csv.reader(f)
+            cols = {name: i for i, name in enumerate(next(reader, []))}
+            url_col = cols.get("url")
+            title_col = cols.get("title")
+            image_col = cols.get("image_url")
+            len_col = cols.get("doc_len")
+
+            # string di-intern: image_url / judul yang sama cukup disimpan sekali
+            for row in reader:
+                URLS.append(sys.intern(_cell(row, url_col)))
+                TITLES.append(sys.intern(_cell(row, title_col) or "Untitled"))
+                IMAGES.append(sys.intern(_cell(row, image_col)))
+                doc_lens_raw.append(_cell(row, len_col))
+
+        DOC_LENS = np.fromiter((int(x or 1) for x in doc_lens_raw),
+                               dtype=np.int32, count=len(doc_lens_raw))
+        TOTAL_DOCS = len(URLS)
+
+        # fallback kalau meta kosong tapi index ada
+        if TOTAL_DOCS == 0 and CSR_DOC_IDS.size:
+            TOTAL_DOCS = int(np.unique(CSR_DOC_IDS).size)
+
+        log(f"doc_meta has {TOTAL_DOCS} docs")
+    except FileNotFoundError:
+        log("doc_meta.csv not found, doc meta is empty")
+    except Exception as e:
+        INIT_ERROR = f"Failed to load doc_meta.csv: {e}"
+        traceback.print_exc()
+
+
+def get_meta(doc_id):
+    """
+    Meta satu dokumen sebagai dict, None kalau doc_id tidak ada.
+    """
+    try:
+        i = int(doc_id)
+    except (TypeError, ValueError):
+        return None
+    if i < 0 or i >= len(URLS):
+        return None
+    return {
+        "url": URLS[i],
+        "title": TITLES[i],
+        "image_url": IMAGES[i],
+        "doc_len": int(DOC_LENS[i]),
+    }
 
 
 # =====================================
-# LOAD CORPUS CONTENT
+# CORPUS CONTENT (MMAP)
 # corpus_clean_v2.csv:
 # url,title,image_url,content_final
 # diasumsikan urutannya sama dgn doc_meta → index baris = doc_id
+#
+# isi artikel tidak dimuat ke RAM; cukup simpan byte offset tiap baris,
+# lalu endpoint detail membaca satu baris langsung dari mmap
 # =====================================
-try:
-    log("Loading data/corpus_clean_v2.csv ...")
-    with open("data/corpus_clean_v2.csv", "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for idx, row in enumerate(reader):
-            doc_id = str(idx)
-            DOC_CONTENT[doc_id] = (row.get("content_final") or "").strip()
-    log(f"corpus_clean_v2 has {len(DOC_CONTENT)} docs")
-except FileNotFoundError:
-    log("corpus_clean_v2.csv not found, DOC_CONTENT is empty (detail view will have no content)")
-except Exception as e:
-    # jangan matikan semuanya, cukup log aja
-    traceback.print_exc()
-    log(f"Failed to load corpus_clean_v2.csv: {e}")
-
-
-# =====================================
-# BM25 SEARCH
-# =====================================
-def bm25_search(query_terms, top_k=20):
+def _scan_corpus_offsets(mm, start):
     """
-    query_terms: list token lower-case
+    Cari (offset, length) tiap record CSV mulai dari byte `start`.
+    Record bisa multi-baris (field dalam tanda kutip), jadi record dianggap
+    selesai kalau jumlah '"' yang sudah dilewati genap.
     """
-    if not INVERTED_INDEX:
-        return []
+    offsets = []
+    size = len(mm)
+    pos = start
+    while pos < size:
+        rec_start = pos
+        quotes = 0
+        while True:
+            nl = mm.find(b"\n", pos)
+            end = size if nl == -1 else nl
+            quotes += mm[pos:end].count(b'"')
+            pos = end + 1
+            if quotes % 2 == 0 or nl == -1:
+                break
+        rec_end = end
+        if rec_end > rec_start and mm[rec_end - 1:rec_end] == b"\r":
+            rec_end -= 1
+        if rec_end > rec_start:
+            offsets.append((rec_start, rec_end - rec_start))
+    return np.asarray(offsets, dtype=np.int64).reshape(-1, 2)
+
+
+def get_content(doc_id):
+    """
+    Ambil content_final untuk satu doc_id, "" kalau tidak ada.
+    """
+    if CORPUS_MM is None:
+        return ""
+    try:
+        idx = int(doc_id)
+    except (TypeError, ValueError):
+        return ""
+    if idx < 0 or idx >= len(CORPUS_OFFSETS):
+        return ""
+
+    off, length = CORPUS_OFFSETS[idx]
+    raw = CORPUS_MM[off:off + length].decode("utf-8")
+    row = next(csv.reader(io.StringIO(raw)), [])
+    if CORPUS_CONTENT_COL >= len(row):
+        return ""
+    return (row[CORPUS_CONTENT_COL] or "").strip()
+
+
+def _open_corpus():
+    global CORPUS_MM, CORPUS_CONTENT_COL, CORPUS_OFFSETS
+    try:
+        log(f"Opening {CORPUS_FILE} (mmap) ...")
+        with open(CORPUS_FILE, "rb") as f:
+            CORPUS_MM = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header_end = CORPUS_MM.find(b"\n")
+        header_end = len(CORPUS_MM) if header_end == -1 else header_end
+        header = next(csv.reader([CORPUS_MM[:header_end].decode("utf-8-sig").strip()]))
+        CORPUS_CONTENT_COL = header.index("content_final")
+
+        # pakai offset yang sudah tersimpan selama tidak lebih tua dari csv-nya
+        if (os.path.exists(CORPUS_OFFSETS_FILE) and
+                os.path.getmtime(CORPUS_OFFSETS_FILE) >= os.path.getmtime(CORPUS_FILE)):
+            CORPUS_OFFSETS = np.load(CORPUS_OFFSETS_FILE)
+        else:
+            CORPUS_OFFSETS = _scan_corpus_offsets(CORPUS_MM, header_end + 1)
+            try:
+                np.save(CORPUS_OFFSETS_FILE, CORPUS_OFFSETS)
+            except OSError as e:
+                # filesystem read-only (mis. Vercel), cukup scan lagi next cold start
+                log(f"Could not save {CORPUS_OFFSETS_FILE}: {e}")
+        log(f"corpus_clean_v2 has {len(CORPUS_OFFSETS)} docs")
+    except FileNotFoundError:
+        log("corpus_clean_v2.csv not found, detail view will have no content")
+    except Exception as e:
+        # jangan matikan semuanya, cukup log aja
+        traceback.print_exc()
+        log(f"Failed to open corpus_clean_v2.csv: {e}")
+        CORPUS_MM = None
 
-    # parameter BM25
-    k1 = 1.5
-    b = 0.75
 
-    N = TOTAL_DOCS or 1
+# =====================================
+# BUILD BM25 CONTRIBUTION MATRIX (CSR)
+# bagian BM25 yang tidak bergantung query:
+#   tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avg_dl))
+# dihitung sekali di sini, jadi saat query tinggal idf * baris term
+# =====================================
+def _build_contrib_matrix():
+    global AVG_DL, DL_ARR, DL_NORM, CONTRIB_CSR, DF_ARR, IDF_ARR, TERM_UB, INIT_ERROR
+    try:
+        if DOC_LENS.size:
+            AVG_DL = float(DOC_LENS.mean())
+
+        DF_ARR = dfs = np.diff(CSR_INDPTR)
+        tfs = CSR_TFS.astype(np.float32)
+
+        max_doc_id = int(CSR_DOC_IDS.max()) if CSR_DOC_IDS.size else -1
+        max_doc_id = max(max_doc_id, DOC_LENS.size - 1)
+
+        # doc yang tidak ada di doc_meta pakai avg_dl (sama seperti sebelumnya)
+        DL_ARR = np.full(max_doc_id + 1, AVG_DL, dtype=np.float32)
+        DL_ARR[:DOC_LENS.size] = DOC_LENS
+
+        # normalisasi panjang dokumen cukup dihitung sekali per doc,
+        # bukan per posting
+        DL_NORM = (K1 * (1 - B + B * DL_ARR / AVG_DL)).astype(np.float32)
+
+        CONTRIB_CSR = (tfs * (K1 + 1) /
+                       (tfs + DL_NORM[CSR_DOC_IDS])).astype(np.float32)
+
+        # idf hanya bergantung statistik korpus -> dihitung sekali untuk semua term
+        # idf = log((N - df + 0.5) / (df + 0.5) + 1)
+        n_docs = TOTAL_DOCS or 1
+        IDF_ARR = np.log1p((n_docs - dfs + 0.5) / (dfs + 0.5)).astype(np.float32)
+
+        # batas atas kontribusi per term = idf * kontribusi terbesar di barisnya
+        term_max = np.zeros(dfs.size, dtype=np.float32)
+        nonempty = dfs > 0
+        if CONTRIB_CSR.size:
+            term_max[nonempty] = np.maximum.reduceat(CONTRIB_CSR, CSR_INDPTR[:-1][nonempty])
+        TERM_UB = IDF_ARR * term_max
+        log(f"contribution matrix built: {len(TERM_ID)} terms, {CONTRIB_CSR.size} postings")
+    except Exception as e:
+        INIT_ERROR = f"Failed to build contribution matrix: {e}"
+        traceback.print_exc()
 
-    # average doc length
-    if DOC_LENGTHS:
-        avg_dl = sum(DOC_LENGTHS.values()) / len(DOC_LENGTHS)
-    else:
-        avg_dl = 300.0  # fallback asal
 
-    scores = defaultdict(float)
+# =====================================
+# BOOTSTRAP
+# semua IO dilakukan saat request pertama (bukan saat import), lalu
+# container yang masih warm tinggal pakai hasilnya
+# =====================================
+@cache
+def _load_all():
+    _load_index()
+    _load_doc_meta()
+    _open_corpus()
+    _build_contrib_matrix()
 
-    for term in query_terms:
-        postings = INVERTED_INDEX.get(term)
-        if not postings:
-            continue
 
-        # postings: dict {doc_id: freq}
-        df = len(postings)
-        if df == 0:
-            continue
+def _bootstrap():
+    # lock supaya request paralel pertama tidak memuat data dua kali
+    with _BOOTSTRAP_LOCK:
+        _load_all()
 
-        idf = math.log((N - df + 0.5) / (df + 0.5) + 1)
 
-        for raw_doc_id, freq in postings.items():
-            doc_id = str(raw_doc_id)
-            tf = int(freq)
+# =====================================
+# SCORING KERNEL
+# menjumlahkan idf * kontribusi untuk postings [start, end) satu term
+# =====================================
+def _score_range_numpy(idf, scores, doc_ids, contrib, start, end):
+    np.add.at(scores, doc_ids[start:end], idf * contrib[start:end])
+
+
+if njit is not None:
+    # nogil: potongan postings bisa dikerjakan beberapa thread sekaligus
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _score_range(idf, scores, doc_ids, contrib, start, end):
+        for j in range(start, end):
+            scores[doc_ids[j]] += idf * contrib[j]
+else:
+    _score_range = _score_range_numpy
+
+
+# postings term yang panjang dipecah ke beberapa thread. doc_id dalam satu
+# baris term unik, jadi tiap potongan menulis ke doc yang berbeda (tanpa race,
+# tanpa buffer per thread). Hanya dipakai kalau kernel numba (lepas GIL) ada;
+# di bawah PARALLEL_MIN_POSTINGS overhead thread lebih mahal dari scoring-nya.
+PARALLEL_MIN_POSTINGS = 200_000
+_SCORE_WORKERS = os.cpu_count() or 1
+_SCORE_POOL = ThreadPoolExecutor(max_workers=_SCORE_WORKERS) if _SCORE_WORKERS > 1 else None
+
+
+def _score_row(term_id, idf, scores):
+    start, end = int(CSR_INDPTR[term_id]), int(CSR_INDPTR[term_id + 1])
+    if (njit is None or _SCORE_POOL is None or
+            end - start < PARALLEL_MIN_POSTINGS):
+        _score_range(idf, scores, CSR_DOC_IDS, CONTRIB_CSR, start, end)
+        return
+
+    bounds = np.linspace(start, end, _SCORE_WORKERS + 1).astype(np.int64)
+    futures = [
+        _SCORE_POOL.submit(_score_range, idf, scores, CSR_DOC_IDS, CONTRIB_CSR,
+                           int(lo), int(hi))
+        for lo, hi in zip(bounds[:-1], bounds[1:])
+    ]
+    for fut in futures:
+        fut.result()
 
-            dl = DOC_LENGTHS.get(doc_id, avg_dl)
 
-            score = idf * ((tf * (k1 + 1)) /
-                           (tf + k1 * (1 - b + b * (dl / avg_dl))))
-            scores[doc_id] += score
+# =====================================
+# BM25 SEARCH
+# =====================================
+def bm25_search(query_terms, top_k=20):
+    """
+    query_terms: list token lower-case
+    """
+    if not TERM_ID:
+        return []
 
-    ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    # akumulasi skor per doc_id (index array = doc_id)
+    score_arr = np.zeros(DL_ARR.size, dtype=np.float32)
+
+    # term yang diulang di query cukup di-scan sekali, kontribusinya
+    # dikali frekuensi term di query (qtf)
+    qtfs = Counter(t for t in query_terms if t in TERM_ID)
+
+    term_ids = np.fromiter((TERM_ID[t] for t in qtfs), dtype=np.int64, count=len(qtfs))
+    qtf_arr = np.fromiter(qtfs.values(), dtype=np.float32, count=len(qtfs))
+
+    # term paling jarang (df kecil) diproses duluan
+    order = np.argsort(DF_ARR[term_ids], kind="stable")
+    term_ids = term_ids[order]
+    qtf_arr = qtf_arr[order]
+    idfs = IDF_ARR[term_ids] * qtf_arr
+
+    # rest_ub[i] = skor maksimum yang masih bisa didapat dari term i..akhir
+    rest_ub = np.zeros(term_ids.size + 1, dtype=np.float32)
+    rest_ub[:-1] = np.cumsum((TERM_UB[term_ids] * qtf_arr)[::-1])[::-1]
+
+    # MaxScore / WAND-lite: selama doc baru masih mungkin masuk top-k, postings
+    # di-scan penuh. Begitu rest_ub < skor ke-k (tau), doc yang belum punya skor
+    # tidak mungkin lagi masuk top-k, jadi term sisanya cukup dicocokkan ke
+    # kandidat yang sudah ada (binary search di postings yang sudah urut).
+    candidates = None
+    for i in range(term_ids.size):
+        if candidates is None:
+            _score_row(term_ids[i], idfs[i], score_arr)
+            if top_k > 0 and rest_ub[i + 1] > 0 and np.count_nonzero(score_arr) >= top_k:
+                tau = np.partition(score_arr, -top_k)[-top_k]
+                if rest_ub[i + 1] < tau:
+                    candidates = np.flatnonzero(score_arr)
+        else:
+            start, end = CSR_INDPTR[term_ids[i]], CSR_INDPTR[term_ids[i] + 1]
+            row = CSR_DOC_IDS[start:end]
+            pos = np.minimum(np.searchsorted(row, candidates), row.size - 1)
+            hit = row[pos] == candidates
+            score_arr[candidates[hit]] += idfs[i] * CONTRIB_CSR[start + pos[hit]]
+
+    # ambil top-k tanpa sort seluruh kandidat: argpartition O(n),
+    # lalu sort hanya k elemen teratas (skor sama -> doc_id kecil duluan)
+    k = min(top_k, int(np.count_nonzero(score_arr)))
+    if k <= 0:
+        return []
+    idx = np.argpartition(score_arr, -k)[-k:]
+    idx = idx[np.lexsort((idx, -score_arr[idx]))]
 
     results = []
-    for doc_id, score in ranked[:top_k]:
-        meta = DOC_META.get(doc_id, {})
+    for i in idx:
+        meta = get_meta(i) or {}
         results.append({
-            "doc_id": doc_id,
+            "doc_id": str(i),
             "title": meta.get("title", "Untitled"),
             "url": meta.get("url", ""),
             "image_url": meta.get("image_url", ""),
             "doc_len": meta.get("doc_len", None),
-            "score": score,
+            "score": float(score_arr[i]),
         })
 
     return results
 
 
+# =====================================
+# CACHE QUERY
+# query yang sama (atau urutan term berbeda) tidak perlu di-scoring ulang
+# =====================================
+# tokenisasi disamakan dengan preprocess_text di quick_indexing.py:
+# buang URL, hanya alfanumerik ASCII, token minimal 2 karakter
+_URL_RE = re.compile(r"http\S+|www\.\S+")
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+
+@lru_cache(maxsize=4096)
+def tokenize(q: str):
+    text = _URL_RE.sub(" ", q.lower())
+    return tuple(sys.intern(t) for t in _TOKEN_RE.findall(text) if len(t) > 1)
+
+
+@lru_cache(maxsize=2048)
+def _cached_search(terms: tuple, top_k: int):
+    # tiap hasil disimpan sudah ter-encode JSON (bytes, immutable),
+    # jadi entry cache bisa langsung dipakai tanpa copy / encode ulang
+    return tuple(orjson.dumps(r) for r in bm25_search(list(terms), top_k=top_k))
+
+
+def cached_bm25_search(query_terms, top_k=20):
+    """
+    Sama seperti bm25_search, tapi hasilnya tuple JSON bytes per dokumen.
+    """
+    # BM25 komutatif terhadap urutan term -> sort jadi key kanonik
+    # (duplikat tetap dipertahankan supaya skor sama dengan bm25_search)
+    return _cached_search(tuple(sorted(query_terms)), top_k)
+
+
+def _search_body(q, result_chunks):
+    # {"query":...,"count":N,"results":[...]} dirakit langsung sebagai bytes
+    return b"".join((
+        b'{"query":', orjson.dumps(q),
+        b',"count":', str(len(result_chunks)).encode(),
+        b',"results":[', b",".join(result_chunks), b"]}",
+    ))
+
+
 # =====================================
 # HTTP HANDLER UNTUK VERCEL
 # =====================================
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         try:
+            _bootstrap()
+
             if INIT_ERROR is not None:
-                body = json.dumps({
+                body = orjson.dumps({
                     "error": "INIT_ERROR",
                     "message": INIT_ERROR,
-                }).encode("utf-8")
+                })
                 self.send_response(500)
                 self.send_header("Content-Type", "application/json; charset=utf-8")
                 self.end_headers()
@@ -190,14 +509,14 @@ class handler(BaseHTTPRequestHandler):
                 except ValueError:
                     doc_id = str(doc_id_param)
 
-                meta = DOC_META.get(doc_id)
-                content = DOC_CONTENT.get(doc_id, "")
+                meta = get_meta(doc_id)
+                content = get_content(doc_id)
 
                 if not meta and not content:
-                    body = json.dumps({
+                    body = orjson.dumps({
                         "error": "DOCUMENT_NOT_FOUND",
                         "requested_id": doc_id,
-                    }).encode("utf-8")
+                    })
                     self.send_response(404)
                     self.send_header("Content-Type", "application/json; charset=utf-8")
                     self.end_headers()
@@ -213,7 +532,7 @@ class handler(BaseHTTPRequestHandler):
                     "content": content,
                 }
 
-                body = json.dumps(doc, ensure_ascii=False).encode("utf-8")
+                body = orjson.dumps(doc)
                 self.send_response(200)
                 self.send_header("Content-Type", "application/json; charset=utf-8")
                 self.end_headers()
@@ -240,14 +559,9 @@ class handler(BaseHTTPRequestHandler):
             except ValueError:
                 top_k = 20
 
-            query_terms = q.lower().split()
-            results = bm25_search(query_terms, top_k=top_k)
-
-            body = json.dumps({
-                "query": q,
-                "count": len(results),
-                "results": results,
-            }, ensure_ascii=False).encode("utf-8")
+            query_terms = tokenize(q)
+            results = cached_bm25_search(query_terms, top_k=top_k)
+            body = _search_body(q, results)
 
             self.send_response(200)
             self.send_header("Content-Type", "application/json; charset=utf-8")
@@ -256,10 +570,10 @@ class handler(BaseHTTPRequestHandler):
 
         except Exception as e:
             traceback.print_exc()
-            body = json.dumps({
+            body = orjson.dumps({
                 "error": "RUNTIME_ERROR",
                 "message": str(e),
-            }).encode("utf-8")
+            })
             self.send_response(500)
             self.send_header("Content-Type", "application/json; charset=utf-8")
             self.end_headers()
@@ -0,0 +1,61 @@
+"""
+Konversi inverted_index.json ke index biner untuk api/search.py
+Membuat index.bin dan terms.json
+
+Layout index.bin (semua int32 little-endian):
+    [num_terms][offsets x (num_terms + 1)][dids x nnz][tfs x nnz]
+postings term_id ada di dids/tfs [offsets[term_id], offsets[term_id + 1])
+
+Jalankan ulang setiap kali inverted_index.json di-regenerate
+(mis. setelah quick_indexing.py).
+"""
+import json
+from array import array
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).parent
+DATA_DIR = BASE_DIR / "data"
+
+INDEX_FILE = DATA_DIR / "inverted_index.json"
+INDEX_BIN_FILE = DATA_DIR / "index.bin"
+TERMS_FILE = DATA_DIR / "terms.json"
+
+print(f"[INFO] Membaca: {INDEX_FILE}")
+with open(INDEX_FILE, "r", encoding="utf-8") as f:
+    inverted_index = json.load(f)
+print(f"[INFO] Total unique terms: {len(inverted_index)}")
+
+# postings semua term disambung jadi satu array flat;
+# postings term_id ada di [offsets[term_id], offsets[term_id + 1])
+# buffer pakai array('i') (int32 packed), bukan list of int Python
+term2id = {}
+offsets = np.zeros(len(inverted_index) + 1, dtype="<i4")
+dids_buf = array("i")
+tfs_buf = array("i")
+
+for term_id, (term, postings) in enumerate(inverted_index.items()):
+    term2id[term] = term_id
+    # postings per term harus urut doc_id (dipakai binary search di api/search.py)
+    doc_ids = sorted(map(int, postings))
+    dids_buf.extend(doc_ids)
+    tfs_buf.extend(int(postings[str(d)]) for d in doc_ids)
+    offsets[term_id + 1] = len(dids_buf)
+
+dids = np.frombuffer(dids_buf, dtype=np.int32)
+tfs = np.frombuffer(tfs_buf, dtype=np.int32)
+
+header = np.asarray([len(term2id)], dtype="<i4")
+with open(INDEX_BIN_FILE, "wb") as f:
+    for part in (header, offsets, dids, tfs):
+        f.write(part.astype("<i4", copy=False).tobytes())
+with open(TERMS_FILE, "w", encoding="utf-8") as f:
+    json.dump(term2id, f, ensure_ascii=False)
+
+print(f"     ✓ Saved: {INDEX_BIN_FILE}")
+print(f"     ✓ Saved: {TERMS_FILE}")
+
+print(f"\n[SUCCESS] Konversi selesai!")
+print(f"   - Terms: {len(term2id)}")
+print(f"   - Postings: {dids.size}")